@@ -194,8 +194,13 @@ class GpioBase:
 
 class GpioOutputPin(GpioBase):
     def write(self, value: int) -> None:
-        self.value = int(not not value)
-        self.line.set_value(self.value)
+        value = int(not not value)
+        if value == self.value:
+            # Moonraker holds the only request for this line, so the
+            # cached value reflects the current state of the pin
+            return
+        self.line.set_value(value)
+        self.value = value
 
 
 MAX_ERRORS = 50
@@ -241,6 +241,9 @@ class KlippyAPI(Subscribable):
                     status: Dict[str, Any],
                     eventtime: float
                     ) -> None:
+        if not status:
+            # None of the objects subscribed by components were updated
+            return
         self.server.send_event("server:status_update", status)
 
 def load_component(config: ConfigHelper) -> KlippyAPI:
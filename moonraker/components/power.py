@@ -10,6 +10,7 @@ import json
 import struct
 import socket
 import asyncio
+import functools
 import time
 from urllib.parse import quote, urlencode
 
@@ -77,13 +78,13 @@ class PrinterPower:
             self._handle_list_devices)
         self.server.register_endpoint(
             "/machine/device_power/status", ['GET'],
-            self._handle_batch_power_request)
+            functools.partial(self._handle_batch_power_request, "status"))
         self.server.register_endpoint(
             "/machine/device_power/on", ['POST'],
-            self._handle_batch_power_request)
+            functools.partial(self._handle_batch_power_request, "on"))
         self.server.register_endpoint(
             "/machine/device_power/off", ['POST'],
-            self._handle_batch_power_request)
+            functools.partial(self._handle_batch_power_request, "off"))
         self.server.register_endpoint(
             "/machine/device_power/device", ['GET', 'POST'],
             self._handle_single_power_request)
@@ -147,20 +148,28 @@ class PrinterPower:
         return {dev_name: result}
 
     async def _handle_batch_power_request(self,
+                                          req: str,
                                           web_request: WebRequest
                                           ) -> Dict[str, Any]:
         args = web_request.get_args()
-        ep = web_request.get_endpoint()
         if not args:
             raise self.server.error("No arguments provided")
-        requested_devs = {k: self.devices.get(k, None) for k in args}
-        result = {}
-        req = ep.split("/")[-1]
-        for name, device in requested_devs.items():
+        result: Dict[str, Any] = {}
+        pending: Dict[str, Coroutine] = {}
+        for name in args:
+            device = self.devices.get(name, None)
             if device is not None:
-                result[name] = await device.process_request(req)
-            else:
-                result[name] = "device_not_found"
+                pending[name] = device.process_request(req)
+            result[name] = "device_not_found"
+        # Process requested devices concurrently.  Allow every device to
+        # complete its request before reporting the first error.
+        states = await asyncio.gather(
+            *pending.values(), return_exceptions=True
+        )
+        for state in states:
+            if isinstance(state, BaseException):
+                raise state
+        result.update(zip(pending.keys(), states))
         return result
 
     def set_device_power(
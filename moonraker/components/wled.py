@@ -13,7 +13,6 @@ from enum import Enum
 import logging
 import json
 import asyncio
-import serial_asyncio
 from tornado.httpclient import AsyncHTTPClient
 from tornado.httpclient import HTTPRequest
 
@@ -324,6 +323,9 @@ class StripSerial(Strip):
                                      state: Dict[str, Any]) -> None:
         async with self.request_mutex:
             if not hasattr(self, 'ser'):
+                # Defer the pyserial import until a serial strip connects,
+                # configurations with only http strips never require it
+                import serial_asyncio
                 _, self.ser = await serial_asyncio.open_serial_connection(
                     url=self.serialport, baudrate=self.baud)
 
@@ -5,6 +5,8 @@
 # This file may be distributed under the terms of the GNU GPLv3 license
 
 from __future__ import annotations
+import os
+import contextlib
 import asyncio
 import inspect
 import functools
@@ -26,6 +28,14 @@ if TYPE_CHECKING:
     FlexCallback = Callable[..., Optional[Awaitable]]
     TimerCallback = Callable[[float], Union[float, Awaitable[float]]]
 
+_uvl_var = os.getenv("MOONRAKER_ENABLE_UVLOOP", "y").lower()
+UVLOOP_ENABLED = False
+if _uvl_var in ["y", "yes", "true"]:
+    with contextlib.suppress(ImportError):
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        UVLOOP_ENABLED = True
+
 class EventLoop:
     TimeoutError = asyncio.TimeoutError
     def __init__(self) -> None:
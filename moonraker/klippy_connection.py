@@ -9,11 +9,11 @@ from __future__ import annotations
 import os
 import time
 import logging
-import json
 import getpass
 import asyncio
 import pathlib
 from .utils import ServerError, get_unix_peer_credentials
+from .utils import json_wrapper as jsonw
 
 # Annotation imports
 from typing import (
@@ -52,6 +52,8 @@ INIT_TIME = .25
 LOG_ATTEMPT_INTERVAL = int(2. / INIT_TIME + .5)
 MAX_LOG_ATTEMPTS = 10 * LOG_ATTEMPT_INTERVAL
 UNIX_BUFFER_LIMIT = 20 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+PENDING_LOG_INTERVAL = 60.
 SVC_INFO_KEY = "klippy_connection.service_info"
 
 class KlippyConnection:
@@ -81,6 +83,8 @@ class KlippyConnection:
         # registered remote methods should be of the notification type,
         # they do not return a response to Klippy after execution
         self.pending_requests: Dict[int, KlippyRequest] = {}
+        self.pending_log_timer = self.event_loop.register_timer(
+            self._log_pending_requests)
         self.remote_methods: Dict[str, FlexCallback] = {}
         self.klippy_reg_methods: List[str] = []
         self.register_remote_method(
@@ -161,10 +165,11 @@ class KlippyConnection:
 
     async def _read_stream(self, reader: asyncio.StreamReader) -> None:
         errors_remaining: int = 10
+        buf = bytearray()
         while not reader.at_eof():
             try:
-                data = await reader.readuntil(b'\x03')
-            except (ConnectionError, asyncio.IncompleteReadError):
+                data = await reader.read(READ_CHUNK_SIZE)
+            except ConnectionError:
                 break
             except asyncio.CancelledError:
                 logging.exception("Klippy Stream Read Cancelled")
@@ -175,13 +180,45 @@ class KlippyConnection:
                 if not errors_remaining or not self.is_connected():
                     break
                 continue
+            if not data:
+                break
             errors_remaining = 10
-            try:
-                decoded_cmd = json.loads(data[:-1])
-                self._process_command(decoded_cmd)
-            except Exception:
-                logging.exception(
-                    f"Error processing Klippy Host Response: {data.decode()}")
+            # Any data remaining in the buffer is known not to contain
+            # a terminator, so only newly received data is scanned
+            scan_pos = len(buf)
+            buf.extend(data)
+            # Process all complete frames received, then discard them
+            # from the buffer in a single operation
+            start = 0
+            with memoryview(buf) as view:
+                while True:
+                    end = buf.find(b"\x03", scan_pos)
+                    if end < 0:
+                        break
+                    # Decode frames from a view of the buffer to avoid a copy.
+                    # Each view must be released before the buffer is resized.
+                    with view[start:end] as frame:
+                        try:
+                            decoded_cmd = jsonw.loads(frame)
+                            self._process_command(decoded_cmd)
+                        except Exception:
+                            resp = bytes(frame).decode(errors="replace")
+                            logging.exception(
+                                "Error processing Klippy Host Response: "
+                                f"{resp}"
+                            )
+                    start = scan_pos = end + 1
+            if start:
+                del buf[:start]
+            if len(buf) > UNIX_BUFFER_LIMIT:
+                # The stream cannot be resynchronized without losing the
+                # response to a pending request, close the connection so
+                # all pending requests are failed.
+                logging.info(
+                    "Klippy frame exceeds buffer limit of "
+                    f"{UNIX_BUFFER_LIMIT} bytes, closing connection"
+                )
+                break
         if not self.closing:
             logging.debug("Klippy Disconnection From _read_stream()")
             await self.close()
@@ -191,9 +228,19 @@ class KlippyConnection:
             self.pending_requests.pop(request.id, None)
             request.notify(ServerError("Klippy Host not connected", 503))
             return
-        data = json.dumps(request.to_dict()).encode() + b"\x03"
         try:
-            self.writer.write(data)
+            payload = jsonw.dumps(request.to_dict())
+        except Exception:
+            logging.exception("Error encoding Klippy Request")
+            self.pending_requests.pop(request.id, None)
+            request.notify(ServerError("Klippy Request Encoding Error", 400))
+            return
+        # Pass the payload and terminator separately rather than
+        # concatenating them, transports that support scatter/gather
+        # writes (ie: uvloop) send both without an intermediate copy
+        data = (payload, b"\x03")
+        try:
+            self.writer.writelines(data)
             await self.writer.drain()
         except asyncio.CancelledError:
             self.pending_requests.pop(request.id, None)
@@ -203,8 +250,23 @@ class KlippyConnection:
             self.pending_requests.pop(request.id, None)
             request.notify(ServerError("Klippy Write Request Error", 503))
             if not self.closing:
+                # The write may be running in the connection task, which
+                # holds the connection mutex.  Schedule the close so it
+                # does not cancel or block on the current task.
                 logging.debug("Klippy Disconnection From _write_request()")
-                await self.close()
+                self.event_loop.register_callback(self.close)
+
+    def _log_pending_requests(self, eventtime: float) -> float:
+        # Requests are checked once per interval, so a request is first
+        # reported when it has been pending between one and two intervals
+        now = time.monotonic()
+        for request in self.pending_requests.values():
+            pending_time = now - request.created_at
+            if pending_time >= PENDING_LOG_INTERVAL:
+                logging.info(
+                    f"Request '{request.rpc_method}' pending: "
+                    f"{pending_time:.2f} seconds")
+        return eventtime + PENDING_LOG_INTERVAL
 
     def register_remote_method(self,
                                method_name: str,
@@ -263,6 +325,7 @@ class KlippyConnection:
                     continue
                 logging.info("Klippy Connection Established")
                 self.writer = writer
+                self.pending_log_timer.start(PENDING_LOG_INTERVAL)
                 if self._get_peer_credentials(writer):
                     machine: Machine = self.server.lookup_component("machine")
                     provider = machine.get_system_provider()
@@ -326,12 +389,20 @@ class KlippyConnection:
                 app.register_remote_handler(ep)
 
     async def _request_initial_subscriptions(self) -> None:
+        # The subscriptions are independent, request them concurrently
+        await asyncio.gather(
+            self._subscribe_webhooks(), self._subscribe_gcode_output()
+        )
+
+    async def _subscribe_webhooks(self) -> None:
         try:
             await self.klippy_apis.subscribe_objects({'webhooks': None})
         except ServerError as e:
             logging.exception("Unable to subscribe to webhooks object")
         else:
             logging.info("Webhooks Subscribed")
+
+    async def _subscribe_gcode_output(self) -> None:
         try:
             await self.klippy_apis.subscribe_gcode_output()
         except ServerError as e:
@@ -341,6 +412,12 @@ class KlippyConnection:
         else:
             logging.info("GCode Output Subscribed")
 
+    async def _register_klippy_method(self, method: str) -> None:
+        try:
+            await self.klippy_apis.register_method(method)
+        except ServerError:
+            logging.exception(f"Unable to register method '{method}'")
+
     async def _check_ready(self) -> None:
         send_id = not self._klippy_identified
         result: Dict[str, Any]
@@ -371,9 +448,11 @@ class KlippyConnection:
             await self._request_endpoints()
         self._state = result["state"]
         if self._state != "startup":
-            await self._request_initial_subscriptions()
-            # Register remaining endpoints available
-            await self._request_endpoints()
+            # Subscribe and register remaining endpoints available
+            await asyncio.gather(
+                self._request_initial_subscriptions(),
+                self._request_endpoints()
+            )
             startup_state = self._state
             await self.server.send_event(
                 "server:klippy_started", startup_state
@@ -387,12 +466,10 @@ class KlippyConnection:
             else:
                 await self._verify_klippy_requirements()
                 # register methods with klippy
-                for method in self.klippy_reg_methods:
-                    try:
-                        await self.klippy_apis.register_method(method)
-                    except ServerError:
-                        logging.exception(
-                            f"Unable to register method '{method}'")
+                await asyncio.gather(*[
+                    self._register_klippy_method(method)
+                    for method in self.klippy_reg_methods
+                ])
                 if self._state == "ready":
                     logging.info("Klippy ready")
                     await self.server.send_event("server:klippy_ready")
@@ -442,11 +519,22 @@ class KlippyConnection:
     def _process_command(self, cmd: Dict[str, Any]) -> None:
         method = cmd.get('method', None)
         if method is not None:
-            # This is a remote method called from klippy
-            if method in self.remote_methods:
+            # This is a remote method called from klippy.  Status updates
+            # and gcode responses are by far the most frequent and their
+            # handlers are synchronous, so they are called directly.
+            if method == "process_status_update":
+                params = cmd['params']
+                self._process_status_update(
+                    params['eventtime'], params['status'])
+                return
+            elif method == "process_gcode_response":
+                self._process_gcode_response(cmd['params']['response'])
+                return
+            cb = self.remote_methods.get(method)
+            if cb is not None:
                 params = cmd.get('params', {})
-                self.event_loop.register_callback(
-                    self._execute_method, method, **params)
+                self.event_loop.create_task(
+                    self._execute_method(method, cb, params))
             else:
                 logging.info(f"Unknown method received: {method}")
             return
@@ -468,9 +556,11 @@ class KlippyConnection:
             result = ServerError(err, 400)
         request.notify(result)
 
-    async def _execute_method(self, method_name: str, **kwargs) -> None:
+    async def _execute_method(
+        self, method_name: str, cb: FlexCallback, params: Dict[str, Any]
+    ) -> None:
         try:
-            ret = self.remote_methods[method_name](**kwargs)
+            ret = cb(**params)
             if ret is not None:
                 await ret
         except Exception:
@@ -534,7 +624,7 @@ class KlippyConnection:
             raise self.server.error(
                 "No connection associated with subscription request")
         self.subscriptions[conn] = sub
-        all_subs: Dict[str, Any] = {}
+        all_subs: Dict[str, Optional[Set[str]]] = {}
         # request superset of all client subscriptions
         for sub in self.subscriptions.values():
             for obj, items in sub.items():
@@ -543,11 +633,13 @@ class KlippyConnection:
                     if items is None or pi is None:
                         all_subs[obj] = None
                     else:
-                        uitems = list(set(pi) | set(items))
-                        all_subs[obj] = uitems
+                        pi.update(items)
                 else:
-                    all_subs[obj] = items
-        args['objects'] = all_subs
+                    all_subs[obj] = None if items is None else set(items)
+        args['objects'] = {
+            obj: None if items is None else list(items)
+            for obj, items in all_subs.items()
+        }
         args['response_template'] = {'method': "process_status_update"}
 
         result = await self._request_standard(web_request)
@@ -573,7 +665,7 @@ class KlippyConnection:
         # Create a base klippy request
         base_request = KlippyRequest(rpc_method, args)
         self.pending_requests[base_request.id] = base_request
-        self.event_loop.register_callback(self._write_request, base_request)
+        await self._write_request(base_request)
         return await base_request.wait()
 
     def remove_subscription(self, conn: Subscribable) -> None:
@@ -624,6 +716,7 @@ class KlippyConnection:
         await machine.do_service_action("start", self.unit_name)
 
     async def _on_connection_closed(self) -> None:
+        self.pending_log_timer.stop()
         self._klippy_identified = False
         self._klippy_initializing = False
         self._klippy_started = False
@@ -654,40 +747,36 @@ class KlippyConnection:
             not self.connection_task.done()
         ):
             self.connection_task.cancel()
-        async with self.connection_mutex:
-            if self.writer is not None:
-                try:
-                    self.writer.close()
-                    await self.writer.wait_closed()
-                except Exception:
-                    logging.exception("Error closing Klippy Unix Socket")
-                self.writer = None
-                await self._on_connection_closed()
-        self.closing = False
+        try:
+            async with self.connection_mutex:
+                if self.writer is not None:
+                    try:
+                        self.writer.close()
+                        await self.writer.wait_closed()
+                    except Exception:
+                        logging.exception("Error closing Klippy Unix Socket")
+                    self.writer = None
+                    await self._on_connection_closed()
+        finally:
+            self.closing = False
 
 # Basic KlippyRequest class, easily converted to dict for json encoding
 class KlippyRequest:
+    __slots__ = (
+        "id", "rpc_method", "params", "_event", "response", "created_at"
+    )
     def __init__(self, rpc_method: str, params: Dict[str, Any]) -> None:
         self.id = id(self)
         self.rpc_method = rpc_method
         self.params = params
         self._event = asyncio.Event()
         self.response: Any = None
+        self.created_at = time.monotonic()
 
     async def wait(self) -> Any:
-        # Log pending requests every 60 seconds
-        start_time = time.time()
-        while True:
-            try:
-                await asyncio.wait_for(self._event.wait(), 60.)
-            except asyncio.TimeoutError:
-                pending_time = time.time() - start_time
-                logging.info(
-                    f"Request '{self.rpc_method}' pending: "
-                    f"{pending_time:.2f} seconds")
-                self._event.clear()
-                continue
-            break
+        # Long running requests are logged by the KlippyConnection
+        if not self._event.is_set():
+            await self._event.wait()
         if isinstance(self.response, ServerError):
             raise self.response
         return self.response
@@ -18,10 +18,11 @@ import logging
 import signal
 import asyncio
 from . import confighelper
-from .eventloop import EventLoop
+from .eventloop import EventLoop, UVLOOP_ENABLED
 from .app import MoonrakerApp
 from .klippy_connection import KlippyConnection
 from .utils import ServerError, Sentinel, get_software_version
+from .utils import json_wrapper as jsonw
 from .loghelper import LogManager
 
 # Annotation imports
@@ -85,6 +86,12 @@ class Server:
         log_level = logging.DEBUG if args["verbose"] else logging.INFO
         logging.getLogger().setLevel(log_level)
         self.event_loop.set_debug(args["asyncio_debug"])
+        self.add_log_rollover_item(
+            "uvloop", f"uvloop enabled: {UVLOOP_ENABLED}", log=False
+        )
+        self.add_log_rollover_item(
+            "orjson", f"orjson enabled: {jsonw.ORJSON_ENABLED}", log=False
+        )
         self.klippy_connection = KlippyConnection(self)
 
         # Tornado Application/Server
@@ -314,16 +321,20 @@ class Server:
 
     def send_event(self, event: str, *args) -> asyncio.Future:
         fut = self.event_loop.create_future()
+        events = self.events.get(event)
+        if not events:
+            # No registered handlers, there is nothing to schedule
+            fut.set_result(None)
+            return fut
         self.event_loop.register_callback(
-            self._process_event, fut, event, *args)
+            self._process_event, fut, events, *args)
         return fut
 
     async def _process_event(self,
                              fut: asyncio.Future,
-                             event: str,
+                             events: List[FlexCallback],
                              *args
                              ) -> None:
-        events = self.events.get(event, [])
         coroutines: List[Coroutine] = []
         try:
             for func in events:
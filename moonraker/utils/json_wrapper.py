@@ -0,0 +1,62 @@
+# Wrapper for orjson with stdlib fallback
+#
+# Copyright (C) 2023 Eric Callahan <arksine.code@gmail.com>
+#
+# This file may be distributed under the terms of the GNU GPLv3 license
+
+from __future__ import annotations
+import os
+import json
+import contextlib
+from typing import Any, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    def dumps(obj: Any) -> bytes:  # type: ignore
+        ...
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        ...
+
+def _std_loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    # The stdlib decoder does not accept memoryviews
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+ORJSON_ENABLED = False
+_orjson_var = os.getenv("MOONRAKER_ENABLE_ORJSON", "y").lower()
+if _orjson_var in ["y", "yes", "true"]:
+    with contextlib.suppress(ImportError):
+        import orjson
+
+        def dumps(obj: Any) -> bytes:  # type: ignore # noqa: F811
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+            except orjson.JSONEncodeError:
+                # orjson does not support integers wider than 64 bits
+                return _std_dumps(obj)
+
+        # NOTE: Unlike the encoder, the orjson decoder does not reject
+        # integers wider than 64 bits, it silently converts them to floats.
+        # The stdlib decoder returns the exact integer.  Klippy does not
+        # send values of this size, so the difference is accepted rather
+        # than scanning every frame on the hot path.
+
+        def loads(  # type: ignore # noqa: F811
+            data: Union[str, bytes, bytearray, memoryview]
+        ) -> Any:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # orjson rejects the NaN and Infinity tokens that Klippy
+                # may emit, the stdlib decoder accepts them
+                return _std_loads(data)
+
+        ORJSON_ENABLED = True
+if not ORJSON_ENABLED:
+    loads = _std_loads  # type: ignore # noqa: F811
+    dumps = _std_dumps  # type: ignore # noqa: F811
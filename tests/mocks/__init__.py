@@ -1,5 +1,6 @@
 from __future__ import annotations
 import asyncio
+from typing import Iterable
 from utils import ServerError
 from .mock_gpio import MockGpiod
 
@@ -10,7 +11,16 @@ class MockWriter:
     def __init__(self, wait_drain: bool = False) -> None:
         self.wait_drain = wait_drain
 
-    def write(self, data: str) -> None:
+    def write(self, data: bytes) -> None:
+        pass
+
+    def writelines(self, data: Iterable[bytes]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    async def wait_closed(self) -> None:
         pass
 
     async def drain(self) -> None:
@@ -21,23 +31,27 @@ class MockWriter:
             raise ServerError("TestError")
 
 class MockReader:
-    def __init__(self, action: str = "") -> None:
+    def __init__(self, action: str = "", data: bytes = b"") -> None:
         self.action = action
+        self.data = data or b"NotJsonDecodable\x03"
         self.eof = False
 
     def at_eof(self) -> bool:
         return self.eof
 
-    async def readuntil(self, stop: bytes) -> bytes:
+    async def read(self, n: int = -1) -> bytes:
         if self.action == "wait":
             evt = asyncio.Event()
             await evt.wait()
             return b""
         elif self.action == "raise_error":
             raise ServerError("TestError")
+        elif self.action == "stream":
+            # Return the same data on every read without reaching EOF
+            return self.data
         else:
             self.eof = True
-            return b"NotJsonDecodable"
+            return self.data
 
 
 class MockComponent:
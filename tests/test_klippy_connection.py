@@ -1,9 +1,11 @@
 from __future__ import annotations
 import pytest
+import math
 import asyncio
 import pathlib
 from typing import TYPE_CHECKING, Dict
 from moonraker.server import ServerError
+from moonraker import klippy_connection
 from moonraker.klippy_connection import KlippyRequest
 from mocks import MockReader, MockWriter
 
@@ -182,6 +184,33 @@ async def test_write_error(base_server: Server):
     await kconn._write_request(req)
     assert isinstance(req.response, ServerError)
 
+@pytest.mark.asyncio
+async def test_write_error_in_connection_task(base_server: Server):
+    req = KlippyRequest("", {})
+    kconn = base_server.klippy_connection
+    kconn.writer = MockWriter()
+
+    async def mock_connect():
+        async with kconn.connection_mutex:
+            kconn.pending_requests[req.id] = req
+            await kconn._write_request(req)
+            return True
+    kconn.connection_task = base_server.event_loop.create_task(mock_connect())
+    assert await kconn.connection_task
+    await asyncio.sleep(.05)
+    assert isinstance(req.response, ServerError)
+    assert not kconn.closing and kconn.writer is None
+
+@pytest.mark.asyncio
+async def test_write_encode_error(base_server: Server):
+    req = KlippyRequest("", {"value": object()})
+    kconn = base_server.klippy_connection
+    kconn.writer = MockWriter()
+    kconn.pending_requests[req.id] = req
+    await kconn._write_request(req)
+    assert isinstance(req.response, ServerError)
+    assert req.id not in kconn.pending_requests
+
 @pytest.mark.asyncio
 async def test_write_cancelled(base_server: Server):
     req = KlippyRequest("", {})
@@ -218,6 +247,71 @@ async def test_read_decode_error(base_server: Server,
     await kconn._read_stream(mock_reader)
     assert "Error processing Klippy Host Response:" in caplog.messages[-1]
 
+@pytest.mark.asyncio
+async def test_read_multiple_frames(base_server: Server):
+    reqs = [KlippyRequest("", {}) for _ in range(2)]
+    kconn = base_server.klippy_connection
+    data = b""
+    for req in reqs:
+        kconn.pending_requests[req.id] = req
+        data += f'{{"id": {req.id}, "result": {{}}}}\x03'.encode()
+    mock_reader = MockReader(data=data)
+    await kconn._read_stream(mock_reader)
+    assert [req.response for req in reqs] == ["ok", "ok"]
+
+@pytest.mark.asyncio
+async def test_read_nan_frame(base_server: Server):
+    req = KlippyRequest("", {})
+    kconn = base_server.klippy_connection
+    kconn.pending_requests[req.id] = req
+    data = f'{{"id": {req.id}, "result": {{"value": NaN}}}}\x03'.encode()
+    mock_reader = MockReader(data=data)
+    await kconn._read_stream(mock_reader)
+    assert math.isnan(req.response["value"])
+
+@pytest.mark.asyncio
+async def test_read_buffer_overflow(base_server: Server,
+                                   monkeypatch: pytest.MonkeyPatch,
+                                   caplog: pytest.LogCaptureFixture):
+    monkeypatch.setattr(klippy_connection, "UNIX_BUFFER_LIMIT", 100)
+    req = KlippyRequest("", {})
+    kconn = base_server.klippy_connection
+    kconn.writer = MockWriter()
+    kconn.pending_requests[req.id] = req
+    mock_reader = MockReader("stream", data=b"x" * 64)
+    await kconn._read_stream(mock_reader)
+    assert any("exceeds buffer limit" in msg for msg in caplog.messages)
+    assert isinstance(req.response, ServerError)
+    assert req.response.status_code == 503
+    assert not kconn.pending_requests
+
+def test_process_status_update(base_server: Server):
+    class TestSubscriber:
+        def send_status(self, status, eventtime):
+            self.result = (status, eventtime)
+    sub = TestSubscriber()
+    kconn = base_server.klippy_connection
+    kconn.subscriptions[sub] = {"toolhead": ["position"]}
+    cmd = {
+        "method": "process_status_update",
+        "params": {
+            "eventtime": 10.,
+            "status": {"toolhead": {"position": [0, 0, 0, 0], "speed": 5}}
+        }
+    }
+    kconn._process_command(cmd)
+    assert sub.result == ({"toolhead": {"position": [0, 0, 0, 0]}}, 10.)
+
+def test_log_pending_requests(base_server: Server,
+                              caplog: pytest.LogCaptureFixture):
+    req = KlippyRequest("test/pending", {})
+    req.created_at -= 90.
+    kconn = base_server.klippy_connection
+    kconn.pending_requests[req.id] = req
+    ret = kconn._log_pending_requests(10.)
+    assert ret == 70.
+    assert "Request 'test/pending' pending:" in caplog.messages[-1]
+
 def test_process_unknown_method(base_server: Server,
                                 caplog: pytest.LogCaptureFixture):
     cmd = {"method": "test_unknown"}
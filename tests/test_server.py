@@ -352,6 +352,10 @@ async def test_send_async_event(full_server: Server):
     result = await fut
     assert result == "test"
 
+def test_send_event_no_handlers(base_server: Server):
+    fut = base_server.send_event("test:no_handlers", "test")
+    assert fut.done() and fut.result() is None
+
 @pytest.mark.asyncio
 async def test_register_remote_method_running(full_server: Server):
     await full_server.start_server(connect_to_klippy=False)